@@ -1,38 +1,60 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from utils import list_batch_files
+
+# Maximum number of batch files read concurrently
+MAX_READ_WORKERS = 8
+
+def _read_batch(file_path: str, file_dtype: pd.CategoricalDtype) -> pd.DataFrame:
+    """
+    Read the BBL and address columns of one batch file, tagged with its file name.
+    
+    The file name is stored as a category code, so each row carries one small
+    integer rather than a reference to a string.
+    """
+    df = pd.read_csv(
+        file_path, usecols=['BBL', 'Primary Address'], dtype={'BBL': 'string[pyarrow]'}, engine='c'
+    )
+    file_code = file_dtype.categories.get_loc(os.path.basename(file_path))
+    df['_file'] = pd.Categorical.from_codes(np.full(len(df), file_code), dtype=file_dtype)
+    return df
 
 def check_duplicates():
     # Get all property data CSV files
     output_dir = os.path.join('data', 'output')
-    csv_files = [f for f in os.listdir(output_dir) if f.startswith('property_data_batch_') and f.endswith('.csv')]
+    csv_files = list_batch_files(output_dir, 'property_data_batch_')
+    if not csv_files:
+        print(f"No batch files found in {output_dir}")
+        return
+    
+    # Read every file, labelling each row with the file it came from. The
+    # per-file row index is kept so the duplicate report shows file line numbers.
+    file_dtype = pd.CategoricalDtype(csv_files)
+    file_paths = [os.path.join(output_dir, csv_file) for csv_file in csv_files]
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(file_paths))) as executor:
+        frames = list(executor.map(partial(_read_batch, file_dtype=file_dtype), file_paths))
+    big = pd.concat(frames)
     
-    # Dictionary to track BBLs and their occurrences
-    bbl_occurrences = defaultdict(list)
+    # Find duplicates within each file in a single pass over the whole corpus
+    dup_mask = big.duplicated(subset=['BBL', '_file'], keep=False)
+    duplicates_by_file = dict(tuple(big[dup_mask].groupby('_file', observed=True)))
     
-    # Check each file
-    for csv_file in sorted(csv_files):
-        file_path = os.path.join(output_dir, csv_file)
+    for csv_file in csv_files:
         print(f"\nChecking {csv_file}...")
-        
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-        
-        # Check for duplicates within the file
-        duplicates = df[df.duplicated(subset=['BBL'], keep=False)]
-        if not duplicates.empty:
+        duplicates = duplicates_by_file.get(csv_file)
+        if duplicates is not None:
             print(f"Found {len(duplicates)} duplicates within {csv_file}:")
             print(duplicates[['BBL', 'Primary Address']].to_string())
-        
-        # Track BBLs across files
-        for bbl in df['BBL']:
-            bbl_occurrences[bbl].append(csv_file)
     
     # Check for BBLs that appear in multiple files
     print("\nChecking for BBLs that appear in multiple files...")
-    for bbl, files in bbl_occurrences.items():
-        if len(files) > 1:
-            print(f"BBL {bbl} appears in {len(files)} files: {', '.join(files)}")
+    cross_file_mask = big.groupby('BBL')['_file'].transform('nunique') > 1
+    files_per_bbl = big[cross_file_mask].groupby('BBL', sort=False)['_file'].unique()
+    for bbl, files in files_per_bbl.items():
+        print(f"BBL {bbl} appears in {len(files)} files: {', '.join(files)}")
 
 if __name__ == "__main__":
-    check_duplicates() 
\ No newline at end of file
+    check_duplicates()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 
 def clean_input_file(input_file: str = 'data/input/input_bbls.csv'):
@@ -7,14 +8,19 @@ def clean_input_file(input_file: str = 'data/input/input_bbls.csv'):
     Args:
         input_file (str): Path to the input CSV file
     """
-    # Read the input file
-    df = pd.read_csv(input_file, dtype={'BBL': str})
+    # Skip the rewrite when the file already holds just the BBL column
+    columns = pd.read_csv(input_file, nrows=0).columns.tolist()
+    if columns == ['BBL']:
+        print(f"Input file {input_file} is already clean")
+        return
     
-    # Keep only the BBL column
-    df = df[['BBL']]
+    # Read only the BBL column from the input file
+    df = pd.read_csv(input_file, usecols=['BBL'], dtype={'BBL': 'string[pyarrow]'})
     
-    # Save the cleaned file
-    df.to_csv(input_file, index=False)
+    # Save the cleaned file to a temporary path, then swap it in atomically
+    tmp_file = f"{input_file}.tmp"
+    df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, input_file)
     print(f"Cleaned input file saved to {input_file}")
     print(f"Total BBLs: {len(df)}")
 
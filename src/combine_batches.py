@@ -1,53 +1,87 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from collections import defaultdict
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from utils import list_batch_files
+
+# Columns with fewer distinct values than this share of rows are stored as categoricals
+CATEGORY_MAX_DISTINCT_RATIO = 0.05
+
+# Maximum number of batch files read concurrently
+MAX_READ_WORKERS = 8
+
+# Rows parsed per chunk, so peak memory does not grow with batch file size
+READ_CHUNK_SIZE = 100_000
+
+def _keep_best_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep one row per BBL, preferring the first row that has a Primary Address.
+    
+    The stable sort on isna() moves rows missing an address behind the complete
+    ones without disturbing their order within either group.
+    """
+    return df.sort_values(
+        'Primary Address', key=lambda s: s.isna(), kind='stable'
+    ).drop_duplicates(subset='BBL', keep='first')
+
+def _read_batch(file_path: str) -> pd.DataFrame:
+    """Read one batch output file in chunks, keeping only the best row per BBL."""
+    best = None
+    for chunk in pd.read_csv(
+        file_path, dtype={'BBL': 'string[pyarrow]', 'Primary Address': 'string[pyarrow]'},
+        chunksize=READ_CHUNK_SIZE
+    ):
+        if best is not None:
+            chunk = pd.concat([best, chunk], ignore_index=True, copy=False)
+        best = _keep_best_rows(chunk)
+    return best
 
 def combine_batches():
     # Get all property data CSV files
     output_dir = os.path.join('data', 'output')
-    csv_files = [f for f in os.listdir(output_dir) if f.startswith('property_data_batch_') and f.endswith('.csv')]
-    
-    # Dictionary to store all data, keyed by BBL
-    all_data = {}
+    csv_files = list_batch_files(output_dir, 'property_data_batch_')
+    if not csv_files:
+        print(f"No batch files found in {output_dir}")
+        return
     
-    # Process each file
-    for csv_file in sorted(csv_files):
-        file_path = os.path.join(output_dir, csv_file)
+    # Read the batch files in parallel, each already reduced to its best row per
+    # BBL, then reduce across files in one pass. executor.map yields in file
+    # order, which keeps the first-file-wins rule of _keep_best_rows.
+    file_paths = []
+    for csv_file in csv_files:
         print(f"Processing {csv_file}...")
-        
-        # Read the CSV file
-        df = pd.read_csv(file_path)
-        
-        # Process each row
-        for _, row in df.iterrows():
-            bbl = row['BBL']
-            
-            # If this BBL is new or has more complete data than what we have
-            if bbl not in all_data or (
-                pd.isna(all_data[bbl]['Primary Address']) and 
-                not pd.isna(row['Primary Address'])
-            ):
-                all_data[bbl] = row
+        file_paths.append(os.path.join(output_dir, csv_file))
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(file_paths))) as executor:
+        frames = list(executor.map(_read_batch, file_paths))
+    combined_df = _keep_best_rows(pd.concat(frames, ignore_index=True, copy=False))
     
-    # Convert dictionary to DataFrame
-    combined_df = pd.DataFrame.from_dict(all_data, orient='index')
+    # Store low-cardinality columns such as Borough as categoricals
+    if len(combined_df):
+        distinct_ratio = combined_df.nunique() / len(combined_df)
+        for col in distinct_ratio.index[distinct_ratio < CATEGORY_MAX_DISTINCT_RATIO]:
+            combined_df[col] = combined_df[col].astype('category')
     
     # Sort by BBL
     combined_df = combined_df.sort_values('BBL')
     
-    # Save to a new CSV file
+    # Save to Parquet for fast downstream reads, plus a human-readable CSV copy,
+    # both encoded straight from the same Arrow table
+    table = pa.Table.from_pandas(combined_df, preserve_index=False)
+    parquet_file = os.path.join(output_dir, 'property_data_combined.parquet')
+    pq.write_table(table, parquet_file, compression='zstd')
     output_file = os.path.join(output_dir, 'property_data_combined.csv')
-    combined_df.to_csv(output_file, index=False)
+    pacsv.write_csv(table, output_file)
     
     # Print summary
     print(f"\nCombined {len(csv_files)} files into one master file:")
     print(f"Total unique BBLs: {len(combined_df)}")
-    print(f"Output saved to: {output_file}")
+    print(f"Output saved to: {output_file} and {parquet_file}")
     
     # Print column information
     print("\nColumns in the combined file:")
-    for col in combined_df.columns:
-        non_empty = combined_df[col].notna().sum()
+    for col, non_empty in combined_df.count().items():
         print(f"{col}: {non_empty} non-empty values")
 
 if __name__ == "__main__":
@@ -1,11 +1,16 @@
 import os
+import mmap
 from scraper import BISScraper
+from utils import list_batch_files
 import time
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import logging
 import sys
 from logging.handlers import RotatingFileHandler
+from typing import Optional
 
 # Get the absolute path to the project root
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -14,42 +19,55 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 log_dir = os.path.join(PROJECT_ROOT, 'logs')
 os.makedirs(log_dir, exist_ok=True)
 
-# Create logger
-logger = logging.getLogger('batch_processor')
-logger.setLevel(logging.INFO)
-
-# Remove any existing handlers
-if logger.hasHandlers():
-    logger.handlers.clear()
-
-# Configure file handler
-log_file = os.path.join(log_dir, 'batch_processing.log')
-file_handler = RotatingFileHandler(
-    log_file,
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5,
-    mode='a',  # Append mode
-    encoding='utf-8'
-)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-# Configure console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+def _configure_logger() -> logging.Logger:
+    """
+    Attach the file and console handlers to the batch logger.
+    
+    Safe to call more than once: handlers are only added the first time, so the
+    log file is opened once per process and messages are never emitted twice.
+    """
+    logger = logging.getLogger('batch_processor')
+    if logger.handlers:
+        return logger
+    
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    
+    # Configure file handler
+    log_file = os.path.join(log_dir, 'batch_processing.log')
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5,
+        mode='a',  # Append mode
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
+    
+    # Configure console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
+    
+    # Prevent propagation to root logger to avoid duplicate messages
+    logger.propagate = False
+    return logger
 
-# Prevent propagation to root logger to avoid duplicate messages
-logger.propagate = False
+logger = _configure_logger()
 
-def process_batches(batch_dir: str = None, output_dir: str = None):
+def process_batches(batch_dir: str = None, output_dir: str = None, cache_backend: Optional[str] = 'sqlite',
+                    concurrency: int = 1):
     """
     Process BBL batches sequentially.
     
     Args:
         batch_dir (str): Directory containing batch CSV files
         output_dir (str): Directory to save output files
+        cache_backend (Optional[str]): Backend for the cache of fetched pages, kept in
+            bis_cache.sqlite at the project root for 'sqlite'. Pages are then not
+            fetched again by overlapping batches or re-runs. None disables the cache.
+        concurrency (int): Number of BBLs fetched at once within each batch
     """
     # Add a clear separator for new runs
     logger.info("="*50)
@@ -74,8 +92,7 @@ def process_batches(batch_dir: str = None, output_dir: str = None):
     os.makedirs(output_dir, exist_ok=True)
     
     # Get list of batch files
-    batch_files = [f for f in os.listdir(batch_dir) if f.startswith('batch_') and f.endswith('.csv')]
-    batch_files.sort()  # Process in order
+    batch_files = list_batch_files(batch_dir, 'batch_')  # Sorted, so batches run in order
     
     if not batch_files:
         logger.warning(f"No batch files found in {batch_dir}")
@@ -84,7 +101,12 @@ def process_batches(batch_dir: str = None, output_dir: str = None):
     logger.info(f"Found {len(batch_files)} batch files to process")
     
     # Initialize scraper
-    scraper = BISScraper()
+    scraper_options = {
+        'cache_name': os.path.join(PROJECT_ROOT, 'bis_cache'),
+        'cache_backend': cache_backend,
+        'concurrency': concurrency
+    }
+    scraper = BISScraper(**scraper_options)
     
     # Process each batch
     for batch_file in batch_files:
@@ -97,17 +119,27 @@ def process_batches(batch_dir: str = None, output_dir: str = None):
             
             # Check if batch is already fully processed
             progress_file = os.path.join(output_dir, f'processed_bbls_batch_{batch_num}.txt')
-            if os.path.exists(progress_file):
-                with open(progress_file, 'r') as f:
-                    processed_bbls = set(f.read().splitlines())
+            if os.path.exists(progress_file) and os.path.getsize(progress_file) > 0:
+                # Count recorded BBLs without decoding the file
+                with open(progress_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    processed_count = mm.read().count(b'\n')
                 
                 batch_path = os.path.join(batch_dir, batch_file)
-                df = pd.read_csv(batch_path)
-                total_bbls = len(df)
+                df = pd.read_csv(batch_path, usecols=['BBL'], dtype={'BBL': 'string[pyarrow]'}, engine='c')
+                # Pad BBLs to 10 digits, as the scraper does before recording progress,
+                # using Arrow's compute kernel directly on the column's buffers
+                total_bbls = pd.Series(
+                    pc.utf8_lpad(pa.array(df['BBL']), width=10, padding='0'), dtype='string[pyarrow]'
+                )
                 
-                if len(processed_bbls) >= total_bbls:
-                    logger.info(f"Batch {batch_num} is already fully processed, continuing to next batch...")
-                    continue
+                # Only load the progress file when it has enough lines to cover the batch
+                if processed_count >= total_bbls.nunique():
+                    processed_bbls = pd.read_csv(progress_file, header=None, names=['BBL'], dtype='string[pyarrow]')['BBL']
+                    bbls_to_process = pd.Index(total_bbls).difference(pd.Index(processed_bbls))
+                    
+                    if bbls_to_process.empty:
+                        logger.info(f"Batch {batch_num} is already fully processed, continuing to next batch...")
+                        continue
             
             # Process the batch
             batch_path = os.path.join(batch_dir, batch_file)
@@ -122,11 +154,11 @@ def process_batches(batch_dir: str = None, output_dir: str = None):
                     # Reinitialize scraper if we've had too many errors
                     if retry_count > 0:
                         logger.warning("Reinitializing scraper due to high error count")
-                        scraper = BISScraper()
+                        scraper = BISScraper(**scraper_options)
                         time.sleep(300)  # Wait 5 minutes before retrying
                     
                     # Process the batch
-                    scraper.process_csv(
+                    scraper.process_bbls_from_csv(
                         input_csv=batch_path,
                         output_csv=output_csv,
                         progress_file=progress_file
@@ -1,13 +1,29 @@
+import asyncio
+import csv
+import io
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+from urllib3.util.retry import Retry
+from requests_cache import BaseCache, CachedSession
+from requests_cache.backends import init_backend
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
 import pandas as pd
 import logging
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Callable, List, Dict, Optional, TextIO, Tuple, Union
 import time
 import re
 import os
 import random
-from datetime import datetime, timedelta
+import threading
+from contextlib import asynccontextmanager
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 
 # Configure logging
 logging.basicConfig(
@@ -16,73 +32,402 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Columns written to the output CSV, in order
+OUTPUT_COLUMNS = ['BBL', 'Primary Address', 'Secondary Addresses', 'Borough', 'ZIP Code', 'BIN']
+
+# Statuses the server uses to ask clients to slow down
+RATE_LIMIT_STATUSES = (429, 503)
+
+# Number of BBLs fetched through one aiohttp session before it is replaced
+SESSION_RECYCLE_BBLS = 500
+
+# How long a fetched property page is served from the HTTP cache
+CACHE_EXPIRE_AFTER = timedelta(days=30)
+
+# Patterns used while parsing property pages, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')  # \s also matches non-breaking spaces
+_BIN_RE = re.compile(r'BIN#\s*(\d+)')
+_BOROUGH_RE = re.compile(r'MANHATTAN|BROOKLYN|QUEENS|BRONX|STATEN ISLAND')
+_ZIP_RE = re.compile(r'\d{5}')
+_DASH_RE = re.compile(r'\s*-\s*')
+
+# Street cells containing any of these are navigation links, not addresses
+_NON_STREET_RE = re.compile('|'.join(map(re.escape, [
+    'View', 'Browse', 'HPD', 'Number', 'This property', 'OR Enter Action Type', 'OR Select from List'
+])))
+
+# Everything the parser reads lives inside tables, so the rest of the page is not built
+_TABLE_STRAINER = SoupStrainer(['table', 'td', 'tr'])
+
+# HTML parsers that parse_property_profile can use
+PARSERS = ('selectolax', 'bs4')
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text from HTML."""
+    # Collapse runs of whitespace (including non-breaking spaces) and trim the ends
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+def extract_address_info(maininfo_texts: List[str], street_rows: List[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Extract primary and secondary addresses from the page.
+    
+    Args:
+        maininfo_texts (List[str]): Raw text of each td.maininfo cell, in page order
+        street_rows (List[Tuple[str, str]]): Raw street name and building number text
+            of each address row, in page order
+        
+    Returns:
+        Dict containing primary address, secondary addresses, and BIN
+    """
+    data = {}
+    
+    # Find primary address, BIN, and borough/ZIP
+    for text in maininfo_texts:
+        text = clean_text(text)
+        if 'BIN#' in text:
+            # Extract BIN number
+            if (bin_match := _BIN_RE.search(text)):
+                data['BIN'] = bin_match.group(1)
+        elif (borough_match := _BOROUGH_RE.search(text)):
+            # This is the borough and ZIP
+            data['Borough'] = borough_match.group(0)
+            if (zip_match := _ZIP_RE.search(text)):
+                data['ZIP Code'] = zip_match.group(0)
+        elif text:
+            # Anything else that is not empty should be the primary address
+            data['Primary Address'] = text
+    
+    # Find secondary addresses (building number ranges with street names)
+    secondary_addresses = []  # Use a list to maintain order
+    seen = set()  # and a set for fast duplicate checks
+    for street_text, numbers_text in street_rows:
+        street_name = clean_text(street_text)
+        building_numbers = clean_text(numbers_text)
+        
+        # Include only if we have both street name and building numbers
+        if (street_name and building_numbers and 
+            not _NON_STREET_RE.search(street_name) and
+            not street_name.endswith(':') and
+            not street_name.startswith('Select')):
+            
+            # Clean up the building numbers format
+            building_numbers = _DASH_RE.sub('-', building_numbers)
+            # Format as "building_numbers street_name"
+            full_address = f"{building_numbers} {street_name}"
+            if full_address not in seen:  # Avoid duplicates while maintaining order
+                seen.add(full_address)
+                secondary_addresses.append(full_address)
+    
+    if secondary_addresses:
+        data['Secondary Addresses'] = ', '.join(secondary_addresses)
+    
+    return data
+
+def _select_cells_bs4(html: str) -> Tuple[List[str], List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """Pick the cells parse_property_profile reads out of the page using BeautifulSoup."""
+    soup = BeautifulSoup(html, 'lxml', parse_only=_TABLE_STRAINER)
+    maininfo_texts = [cell.text for cell in soup.find_all('td', class_='maininfo')]
+    
+    street_rows = []
+    for row in soup.find_all('tr', valign='top'):
+        cells = row.find_all('td', class_='content')
+        # We need at least the street name and building numbers, and skip cross streets rows
+        if len(cells) >= 2 and not any(cell.get('colspan') == "4" for cell in cells):
+            street_rows.append((cells[0].text, cells[1].text))
+    
+    field_rows = []
+    for row in soup.find_all('tr'):
+        cols = row.find_all('td')
+        if len(cols) >= 2:
+            field_rows.append((cols[0].text, cols[1].text))
+    
+    return maininfo_texts, street_rows, field_rows
+
+def _has_class(node, name: str) -> bool:
+    """Check a selectolax node for a class, case-sensitively as BeautifulSoup does."""
+    return name in (node.attributes.get('class') or '').split()
+
+def _select_cells_selectolax(html: str) -> Tuple[List[str], List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Pick the cells parse_property_profile reads out of the page using selectolax.
+    
+    Matches what _select_cells_bs4 picks. Script, style and template text is
+    dropped, as BeautifulSoup leaves it out of .text. Class and valign values
+    are compared in Python, because CSS selectors match them case-insensitively
+    on pages without a doctype.
+    """
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(['script', 'style', 'template'])
+    maininfo_texts = [cell.text() for cell in tree.css('td[class]') if _has_class(cell, 'maininfo')]
+    
+    street_rows = []
+    for row in tree.css('tr[valign]'):
+        if row.attributes.get('valign') != 'top':
+            continue
+        cells = [cell for cell in row.css('td[class]') if _has_class(cell, 'content')]
+        # We need at least the street name and building numbers, and skip cross streets rows
+        if len(cells) >= 2 and not any(cell.attributes.get('colspan') == "4" for cell in cells):
+            street_rows.append((cells[0].text(), cells[1].text()))
+    
+    field_rows = []
+    for row in tree.css('tr'):
+        cols = row.css('td')
+        if len(cols) >= 2:
+            field_rows.append((cols[0].text(), cols[1].text()))
+    
+    return maininfo_texts, street_rows, field_rows
+
+def parse_property_profile(html: str, parser: str = 'selectolax') -> Dict:
+    """
+    Parse the property profile page and extract building information.
+    
+    A module-level function, so it can be sent to worker processes.
+    
+    Args:
+        html (str): The HTML content to parse
+        parser (str): HTML parser to use, one of PARSERS
+        
+    Returns:
+        Dict: Dictionary containing the extracted property information
+    """
+    if parser == 'selectolax':
+        maininfo_texts, street_rows, field_rows = _select_cells_selectolax(html)
+    else:
+        maininfo_texts, street_rows, field_rows = _select_cells_bs4(html)
+    data = {}
+    
+    # Extract address information
+    address_info = extract_address_info(maininfo_texts, street_rows)
+    data.update(address_info)
+    
+    # Walk every table row once, in document order
+    for key_text, value_text in field_rows:
+        key = clean_text(key_text)
+        value = clean_text(value_text)
+        
+        # Skip empty or navigation-related entries
+        if not key or not value or 'BIS Menu' in key or 'Privacy Policy' in key:
+            continue
+        
+        # Clean up the key
+        key = key.replace(':', '')
+        
+        # Skip if this is address-related info we already captured
+        if 'Cross Street' in key or 'View Zoning' in key or 'View Challenge' in key:
+            continue
+        
+        # Store the cleaned data
+        data[key] = value
+    
+    return data
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Token-bucket rate limiter shared by every request a scraper makes.
+        
+        Tokens refill continuously at `rate` per second up to `capacity`; each
+        request takes one, waiting only as long as it takes for that token to
+        arrive. Steady traffic runs at exactly `rate`, and up to `capacity`
+        requests can go out back to back after an idle spell.
+        
+        Args:
+            rate (float): Tokens added per second (sustained requests per second)
+            capacity (float): Maximum number of tokens held (largest burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last refill. Call with the lock held."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            # A negative balance is time owed to callers that reserved earlier
+            return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float):
+        """
+        Hold back every caller for at least `seconds`, e.g. after the server asks to slow down.
+        
+        The pause is added as token debt, so the next request waits `seconds` no
+        matter which caller sends it. Overlapping pauses do not stack.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class SessionRecycler:
+    def __init__(self, create_session: Callable[[], aiohttp.ClientSession], max_uses: int):
+        """
+        Hand out a shared aiohttp session, replacing it every `max_uses` checkouts.
+        
+        The swap never waits for the queue to drain. New checkouts get the new
+        session straight away, and a retired session is closed as soon as the
+        last request still using it finishes.
+        
+        Args:
+            create_session (Callable[[], aiohttp.ClientSession]): Builds a fresh session
+            max_uses (int): Checkouts served by one session before it is replaced
+        """
+        self.create_session = create_session
+        self.max_uses = max_uses
+        self.session = None
+        self.uses = 0
+        self.in_flight = {}  # Session -> number of checkouts still using it
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Use the current session for one fetch."""
+        if self.session is None or self.uses >= self.max_uses:
+            retired = self.session
+            self.session = self.create_session()
+            self.uses = 0
+            self.in_flight[self.session] = 0
+            if retired is not None:
+                await self._close_if_idle(retired)
+        
+        session = self.session
+        self.uses += 1
+        self.in_flight[session] += 1
+        try:
+            yield session
+        finally:
+            self.in_flight[session] -= 1
+            if session is not self.session:
+                await self._close_if_idle(session)
+
+    async def _close_if_idle(self, session: aiohttp.ClientSession):
+        """Close a retired session once nothing is using it."""
+        if self.in_flight.get(session) == 0:
+            del self.in_flight[session]
+            await session.close()
+
+    async def close(self):
+        """Close every session still open."""
+        for session in list(self.in_flight):
+            await session.close()
+        self.in_flight.clear()
+        self.session = None
+
 class BISScraper:
-    def __init__(self, batch_size: int = 100, save_interval: int = 10):
+    def __init__(self, batch_size: int = 100, save_interval: int = 10, concurrency: int = 1,
+                 requests_per_second: float = 1.0, burst: int = 1, parser: str = 'selectolax',
+                 debug: bool = False, cache_name: str = 'bis_cache',
+                 cache_backend: Optional[Union[str, BaseCache]] = None):
         """
         Initialize the BIS scraper with specific headers and session configuration.
         
         Args:
-            batch_size (int): Number of BBLs to process before saving
+            batch_size (int): Number of BBLs to process before syncing results to disk
             save_interval (int): Number of BBLs to process before showing progress
+            concurrency (int): Number of BBLs fetched at once. Values above 1 fetch
+                through aiohttp on an asyncio event loop, with the session replaced
+                every SESSION_RECYCLE_BBLS BBLs.
+            requests_per_second (float): Sustained request rate allowed by the rate limiter
+            burst (int): Number of requests that may be sent back to back after idling
+            parser (str): HTML parser for property pages, 'selectolax' (fastest) or 'bs4'
+                (BeautifulSoup on lxml) as a fallback for pages selectolax handles badly
+            debug (bool): Save each fetched detail page to temp/detail_page.html
+            cache_name (str): Name of the HTTP cache, e.g. the SQLite file name
+            cache_backend (Optional[Union[str, BaseCache]]): requests-cache backend storing
+                fetched pages, e.g. 'sqlite' or 'memory', or a backend instance. Pages
+                in the cache are not fetched again, which covers overlapping BBL ranges
+                and progress lost to a hard kill. None (the default) disables the cache.
         """
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r}, expected one of {PARSERS}")
         self.base_url = "https://a810-bisweb.nyc.gov/bisweb"
+        # Only the borough, block, and lot change between profile URLs
+        self._profile_url_fmt = f"{self.base_url}/PropertyProfileOverviewServlet?boro={{}}&block={{}}&lot={{}}&go3=+GO+&requestid=0"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Referer': 'https://a810-bisweb.nyc.gov/bisweb/bispi00.jsp'
+            'Referer': 'https://a810-bisweb.nyc.gov/bisweb/bispi00.jsp',
+            'Connection': 'keep-alive'
         }
+        # One cache shared by every session, so rotating sessions keeps cached pages
+        self.cache = init_backend(cache_name, cache_backend) if cache_backend is not None else None
         self.session = self._create_session()
         self.batch_size = batch_size
         self.save_interval = save_interval
         self.start_time = None
         self.processed_count = 0
         self.error_count = 0
-        self.last_save_time = None
         self.consecutive_queues = 0
-        self.last_request_time = None
-        self.min_delay = 1.0  # Minimum delay between requests
-        self.max_delay = 3.0  # Maximum delay between requests
-        self.session_rotation_interval = 50  # Rotate session every 50 requests
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_backoff = 300  # Upper bound in seconds for exponential retry backoff
+        self.queue_rotation_threshold = 3  # Rotate session after this many consecutive queue pages
+        self.concurrency = concurrency
+        self.parser = parser
+        self.debug = debug
+        self._parse_pool = None  # Worker processes parsing pages during an async run
 
-    def _create_session(self) -> requests.Session:
-        """Create a new session with randomized headers."""
-        session = requests.Session()
+    def _random_headers(self) -> Dict[str, str]:
+        """Return the request headers with some variation added to the User-Agent."""
         headers = self.headers.copy()
-        # Add some variation to the User-Agent
         headers['User-Agent'] = f"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_{random.randint(12, 15)}_{random.randint(0, 7)}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{random.randint(90, 120)}.0.{random.randint(1000, 9999)}.{random.randint(100, 999)} Safari/537.36"
-        session.headers.update(headers)
+        return headers
+
+    def _create_session(self) -> requests.Session:
+        """Create a new session with randomized headers, caching pages if a cache is configured."""
+        if self.cache is None:
+            session = requests.Session()
+        else:
+            # Pages already fetched successfully are answered from the cache. If the
+            # server errors on a page whose cached copy has expired, the stale copy is used.
+            session = CachedSession(
+                backend=self.cache,
+                expire_after=CACHE_EXPIRE_AFTER,
+                allowable_methods=('GET',),
+                cache_control=False,
+                stale_if_error=True,
+                filter_fn=self._is_cacheable
+            )
+        session.headers.update(self._random_headers())
+        # Keep connections warm across requests and let urllib3 retry transient failures.
+        # 429 and 503 are left to fetch_page, which honors Retry-After itself.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry))
         return session
 
+    def _is_cacheable(self, response: requests.Response) -> bool:
+        """Keep queue pages out of the cache; they are served with a 200 status."""
+        return not self.is_queue_page(response.text)
+
     def _rotate_session(self):
         """Rotate the session to avoid potential session-based rate limiting."""
         self.session = self._create_session()
         logger.info("Rotated session to avoid rate limiting")
 
-    def _calculate_delay(self) -> float:
-        """Calculate delay with jitter and progressive backoff."""
-        base_delay = self.min_delay
-        
-        # Add progressive backoff based on consecutive queues
-        if self.consecutive_queues > 0:
-            base_delay *= (1 + self.consecutive_queues * 0.5)
-        
-        # Add random jitter
-        jitter = random.uniform(0, 0.5)
-        delay = min(base_delay + jitter, self.max_delay)
-        
-        return delay
-
-    def _wait_between_requests(self):
-        """Wait between requests with calculated delay."""
-        if self.last_request_time:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.min_delay:
-                delay = self._calculate_delay()
-                logger.debug(f"Waiting {delay:.2f} seconds between requests")
-                time.sleep(delay)
-        self.last_request_time = time.time()
-
     def load_progress(self, progress_file: str) -> set:
         """Load already processed BBLs from progress file."""
         processed_bbls = set()
@@ -92,10 +437,9 @@ class BISScraper:
                     processed_bbls.add(line.strip())
         return processed_bbls
 
-    def save_progress(self, bbl: str, progress_file: str):
-        """Save processed BBL to progress file."""
-        with open(progress_file, 'a') as f:
-            f.write(f"{bbl}\n")
+    def save_progress(self, bbl: str, progress_fh: TextIO):
+        """Record a processed BBL on the open progress file."""
+        progress_fh.write(f"{bbl}\n")
 
     def estimate_completion_time(self, total_bbls: int) -> str:
         """Estimate completion time based on current processing rate."""
@@ -134,65 +478,41 @@ class BISScraper:
             total_bbls = len(df)
             logger.info(f"Found {total_bbls} BBLs to process in {input_csv}")
             
-            # Initialize results list
-            all_results = []
-            current_batch = []
+            # Work out which BBLs still need fetching, padding and filtering the
+            # whole column at once. The row index gives each BBL's 1-based position.
+            bbls = df['BBL'].astype(str).str.zfill(10)
+            todo = bbls[~bbls.isin(processed_bbls)]
+            skipped = total_bbls - len(todo)
+            if skipped:
+                logger.info(f"Skipping {skipped} already processed BBLs")
+            pending = list(zip((todo.index + 1).tolist(), todo.tolist()))
             
-            for index, bbl in enumerate(df['BBL'], 1):
-                bbl_str = str(bbl).zfill(10)
+            # Keep the output and progress files open for the whole run. Rows are
+            # written as results arrive and both files are synced to disk every
+            # batch_size results, output first, so progress never runs ahead.
+            with open(output_csv, 'a', newline='') as output_fh, open(progress_file, 'a') as progress_fh:
+                writer = csv.DictWriter(output_fh, fieldnames=OUTPUT_COLUMNS, extrasaction='ignore', lineterminator='\n')
+                if output_fh.tell() == 0:
+                    writer.writeheader()
                 
-                # Skip if already processed
-                if bbl_str in processed_bbls:
-                    logger.info(f"Skipping already processed BBL {index} of {total_bbls}: {bbl_str}")
-                    continue
+                if self.concurrency > 1:
+                    asyncio.run(self._process_bbls_async(pending, total_bbls, writer, output_fh, progress_fh))
+                else:
+                    for index, bbl_str in pending:
+                        try:
+                            logger.debug("Processing BBL %d of %d: %s", index, total_bbls, bbl_str)
+                            borough, block, lot = self.parse_bbl(bbl_str)
+                            
+                            property_data = self.get_property_profile(borough=borough, block=block, lot=lot)
+                            self._record_result(bbl_str, property_data, total_bbls, writer, output_fh, progress_fh)
+                            
+                        except Exception as e:
+                            self.error_count += 1
+                            logger.error(f"Error processing BBL {bbl_str}: {str(e)}")
+                            continue
                 
-                try:
-                    logger.info(f"Processing BBL {index} of {total_bbls}: {bbl_str}")
-                    bbl_components = self.parse_bbl(bbl_str)
-                    
-                    # Add rate limiting
-                    if self.last_save_time:
-                        time_since_last = time.time() - self.last_save_time
-                        if time_since_last < 1.0:  # Wait at least 1 second between requests
-                            time.sleep(1.0 - time_since_last)
-                    
-                    property_data = self.get_property_profile(
-                        borough=bbl_components['borough'],
-                        block=bbl_components['block'],
-                        lot=bbl_components['lot']
-                    )
-                    
-                    if property_data:
-                        current_batch.append(property_data)
-                        self.processed_count += 1
-                        
-                        # Save progress
-                        self.save_progress(bbl_str, progress_file)
-                        self.last_save_time = time.time()
-                        
-                        # Show progress periodically
-                        if self.processed_count % self.save_interval == 0:
-                            completion_time = self.estimate_completion_time(total_bbls)
-                            logger.info(f"Progress: {self.processed_count}/{total_bbls} BBLs processed")
-                            logger.info(f"Estimated completion time: {completion_time}")
-                            logger.info(f"Success rate: {(self.processed_count/(self.processed_count + self.error_count))*100:.2f}%")
-                        
-                        # Save batch periodically
-                        if len(current_batch) >= self.batch_size:
-                            self.save_batch(current_batch, output_csv)
-                            current_batch = []
-                    else:
-                        self.error_count += 1
-                        logger.warning(f"No data found for BBL: {bbl_str}")
-                    
-                except Exception as e:
-                    self.error_count += 1
-                    logger.error(f"Error processing BBL {bbl_str}: {str(e)}")
-                    continue
-            
-            # Save any remaining results
-            if current_batch:
-                self.save_batch(current_batch, output_csv)
+                # Sync any results written since the last full batch
+                self._sync_outputs(output_fh, progress_fh)
             
             # Final statistics
             elapsed_time = time.time() - self.start_time
@@ -204,33 +524,139 @@ class BISScraper:
         except Exception as e:
             logger.error(f"Error processing CSV: {str(e)}")
 
-    def save_batch(self, batch: List[Dict], output_csv: str):
-        """Save a batch of results to the CSV file."""
-        try:
-            # Convert batch to DataFrame
-            batch_df = pd.DataFrame(batch)
-            
-            # Create BBL column by combining borough, block, and lot
-            batch_df['BBL'] = batch_df['Borough Code'].astype(str) + batch_df['Block'].astype(str).str.zfill(5) + batch_df['Lot'].astype(str).str.zfill(4)
+    async def _process_bbls_async(self, pending: List[Tuple[int, str]], total_bbls: int,
+                                  writer: csv.DictWriter, output_fh: TextIO, progress_fh: TextIO):
+        """
+        Fetch pending BBLs concurrently with a fixed pool of worker tasks.
+        
+        BBLs are fed through a bounded queue to `concurrency` worker tasks, so at
+        most `concurrency` requests are in flight and the number of tasks and
+        queued BBLs stays fixed however many BBLs are pending. Results are
+        recorded on the event loop thread as each fetch completes. Pages are
+        parsed in a pool of worker processes, so parsing uses the other cores
+        instead of competing with the event loop for the GIL. The aiohttp
+        session is replaced every SESSION_RECYCLE_BBLS BBLs, as long-lived
+        sessions to a single host slow down over multi-hour runs.
+        
+        Args:
+            pending (List[Tuple[int, str]]): (row number, 10-digit BBL) pairs to fetch
+            total_bbls (int): Total number of BBLs in the input, for progress output
+            writer (csv.DictWriter): Writer for the output CSV
+            output_fh (TextIO): Open handle on the output CSV
+            progress_fh (TextIO): Open handle on the file tracking processed BBLs
+        """
+        queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        sessions = SessionRecycler(self._create_async_session, SESSION_RECYCLE_BBLS)
+        
+        async def worker():
+            while True:
+                index, bbl_str = await queue.get()
+                try:
+                    logger.debug("Processing BBL %d of %d: %s", index, total_bbls, bbl_str)
+                    borough, block, lot = self.parse_bbl(bbl_str)
+                    async with sessions.checkout() as session:
+                        property_data = await self.get_property_profile_async(
+                            session, borough=borough, block=block, lot=lot
+                        )
+                    self._record_result(bbl_str, property_data, total_bbls, writer, output_fh, progress_fh)
+                except Exception as e:
+                    self.error_count += 1
+                    logger.error(f"Error processing BBL {bbl_str}: {str(e)}")
+                finally:
+                    queue.task_done()
+        
+        # Workers are started by a forkserver rather than forked from this process,
+        # which by now runs other threads (aiohttp's resolver, executor threads)
+        # whose locks a forked child could inherit while held
+        forkserver = multiprocessing.get_context('forkserver')
+        with ProcessPoolExecutor(max_workers=min(self.concurrency, os.cpu_count() or 1),
+                                 mp_context=forkserver) as parse_pool:
+            self._parse_pool = parse_pool
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            try:
+                for item in pending:
+                    await queue.put(item)
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                await sessions.close()
+                self._parse_pool = None
+
+    def _create_async_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp session holding at most `concurrency` connections to the BIS host."""
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(headers=self._random_headers(), connector=connector)
+
+    def _record_result(self, bbl_str: str, property_data: Optional[Dict], total_bbls: int,
+                       writer: csv.DictWriter, output_fh: TextIO, progress_fh: TextIO):
+        """Record the result of fetching one BBL, syncing to disk every batch_size results."""
+        if property_data:
+            property_data['BBL'] = bbl_str
+            writer.writerow(property_data)
+            self.processed_count += 1
             
-            # Keep only the columns we want, in the desired order
-            columns_to_keep = ['BBL', 'Primary Address', 'Secondary Addresses', 'Borough', 'ZIP Code', 'BIN']
-            batch_df = batch_df[columns_to_keep]
+            # Save progress
+            self.save_progress(bbl_str, progress_fh)
             
-            # Append to existing CSV or create new one
-            if os.path.exists(output_csv):
-                batch_df.to_csv(output_csv, mode='a', header=False, index=False)
-            else:
-                batch_df.to_csv(output_csv, index=False)
+            # Show progress periodically
+            if self.processed_count % self.save_interval == 0:
+                completion_time = self.estimate_completion_time(total_bbls)
+                logger.info(f"Progress: {self.processed_count}/{total_bbls} BBLs processed")
+                logger.info(f"Estimated completion time: {completion_time}")
+                logger.info(f"Success rate: {(self.processed_count/(self.processed_count + self.error_count))*100:.2f}%")
             
-            logger.info(f"Saved batch of {len(batch)} results to {output_csv}")
-        except Exception as e:
-            logger.error(f"Error saving batch: {str(e)}")
+            # Sync results and progress periodically
+            if self.processed_count % self.batch_size == 0:
+                self._sync_outputs(output_fh, progress_fh)
+                logger.info(f"Saved {self.processed_count} results to {output_fh.name}")
+        else:
+            self.error_count += 1
+            logger.warning(f"No data found for BBL: {bbl_str}")
+
+    def _sync_outputs(self, output_fh: TextIO, progress_fh: TextIO):
+        """Flush the output and progress files to disk, output first."""
+        for fh in (output_fh, progress_fh):
+            fh.flush()
+            os.fsync(fh.fileno())
 
     def is_queue_page(self, html: str) -> bool:
         """Check if the response is a queue waiting page."""
         return 'Just a moment' in html and 'Your request is being processed' in html
 
+    def _backoff_delay(self, attempt: int, base_delay: float, retry_after: Optional[str] = None) -> float:
+        """
+        Work out how long to wait before retrying a request.
+        
+        Uses the server's Retry-After header when present (either seconds or an
+        HTTP date), otherwise exponential backoff with full jitter. Either way
+        the wait is capped at max_backoff.
+        
+        Args:
+            attempt (int): Zero-based attempt number that just failed
+            base_delay (float): Base delay in seconds
+            retry_after (Optional[str]): Value of the Retry-After header, if any
+            
+        Returns:
+            float: Seconds to wait
+        """
+        if retry_after:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return min(self.max_backoff, max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds()))
+                except (TypeError, ValueError):
+                    pass
+        return min(self.max_backoff, base_delay * 2 ** attempt) + random.uniform(0, base_delay)
+
     def fetch_page(self, url: str, max_retries: int = 5, retry_delay: int = 6) -> Optional[str]:
         """
         Fetch a web page and return its content, handling queue system with improved rate limiting.
@@ -244,157 +670,148 @@ class BISScraper:
             Optional[str]: The HTML content if successful, None otherwise
         """
         try:
+            # A cached page needs no request, so it skips the rate limiter too
+            cached_html = self._cached_page(url)
+            if cached_html is not None:
+                return cached_html
+            
             for attempt in range(max_retries):
-                self._wait_between_requests()
+                self.bucket.acquire()
                 
-                # Rotate session periodically
-                if self.processed_count % self.session_rotation_interval == 0:
-                    self._rotate_session()
-                
-                logger.info(f"Fetching URL (attempt {attempt + 1}/{max_retries}): {url}")
+                logger.debug("Fetching URL (attempt %d/%d): %s", attempt + 1, max_retries, url)
                 response = self.session.get(url)
+                
+                # Explicit rate limiting: honor Retry-After when the server sends it
+                if response.status_code in RATE_LIMIT_STATUSES:
+                    if response.status_code == 429:
+                        # Rate limited on this session, so start a fresh one
+                        self._rotate_session()
+                    delay = self._backoff_delay(attempt, retry_delay, response.headers.get('Retry-After'))
+                    logger.info(f"Rate limited (HTTP {response.status_code}), retrying in {delay:.1f} seconds...")
+                    # The next acquire() waits out the delay
+                    self.bucket.pause(delay)
+                    continue
                 response.raise_for_status()
                 
+                # Last resort: the queue page is served with a 200 status
                 if self.is_queue_page(response.text):
                     self.consecutive_queues += 1
                     logger.info(f"Request is in queue, waiting... (Consecutive queues: {self.consecutive_queues})")
                     
-                    # Progressive backoff for queue delays
-                    actual_delay = retry_delay * (1 + self.consecutive_queues * 0.5)
-                    time.sleep(actual_delay)
+                    # Only rotate the session once queueing persists
+                    if self.consecutive_queues % self.queue_rotation_threshold == 0:
+                        self._rotate_session()
+                    
+                    time.sleep(self._backoff_delay(attempt, retry_delay))
                     continue
                 
                 # Reset consecutive queues counter on success
                 self.consecutive_queues = 0
-                logger.info(f"Successfully fetched {url}")
+                logger.debug("Successfully fetched %s", url)
                 return response.text
                 
-            logger.error("Max retries reached, still in queue")
+            logger.error("Max retries reached, still queued or rate limited")
             return None
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             return None
 
-    def clean_text(self, text: str) -> str:
-        """Clean and normalize text from HTML."""
-        # Remove multiple spaces and newlines
-        text = re.sub(r'\s+', ' ', text)
-        # Remove leading/trailing spaces
-        text = text.strip()
-        # Remove special characters
-        text = text.replace('\xa0', ' ')
-        return text
-
-    def extract_address_info(self, soup: BeautifulSoup) -> Dict[str, str]:
+    async def fetch_page_async(self, session: aiohttp.ClientSession, url: str,
+                               max_retries: int = 5, retry_delay: int = 6) -> Optional[str]:
         """
-        Extract primary and secondary addresses from the page.
+        Fetch a web page through an aiohttp session, handling the queue system.
+        
+        Mirrors fetch_page, but waits with asyncio.sleep so other requests keep
+        running while this one is queued.
         
         Args:
-            soup: BeautifulSoup object of the page
+            session (aiohttp.ClientSession): Session shared by all concurrent requests
+            url (str): The URL to fetch
+            max_retries (int): Maximum number of retries for queued requests
+            retry_delay (int): Base delay in seconds between retries
             
         Returns:
-            Dict containing primary address, secondary addresses, and BIN
+            Optional[str]: The HTML content if successful, None otherwise
         """
-        data = {}
-        
-        # Find primary address, BIN, and borough/ZIP
-        maininfo_cells = soup.find_all('td', class_='maininfo')
-        for cell in maininfo_cells:
-            text = self.clean_text(cell.text)
-            if 'BIN#' in text:
-                # Extract BIN number
-                bin_match = re.search(r'BIN#\s*(\d+)', text)
-                if bin_match:
-                    data['BIN'] = bin_match.group(1)
-            elif any(borough in text for borough in ['MANHATTAN', 'BROOKLYN', 'QUEENS', 'BRONX', 'STATEN ISLAND']):
-                # This is the borough and ZIP
-                borough_match = re.search(r'(MANHATTAN|BROOKLYN|QUEENS|BRONX|STATEN ISLAND)', text)
-                if borough_match:
-                    data['Borough'] = borough_match.group(1)
-                zip_match = re.search(r'(\d{5})', text)
-                if zip_match:
-                    data['ZIP Code'] = zip_match.group(1)
-            else:
-                # This should be the primary address if it's not empty and not the BIN or borough/ZIP
-                if text and not any(x in text for x in ['BIN#', 'MANHATTAN', 'BROOKLYN', 'QUEENS', 'BRONX', 'STATEN ISLAND']):
-                    data['Primary Address'] = text
-        
-        # Find secondary addresses (building number ranges with street names)
-        secondary_addresses = []  # Use a list to maintain order
-        content_rows = soup.find_all('tr', valign='top')
-        for row in content_rows:
-            cells = row.find_all('td', class_='content')
-            if len(cells) >= 2:  # We need at least the street name and building numbers
-                # Skip if this is a cross streets row
-                if any(cell.get('colspan') == "4" for cell in cells):
-                    continue
-                    
-                street_name = self.clean_text(cells[0].text)
-                building_numbers = self.clean_text(cells[1].text) if len(cells) > 1 else None
+        try:
+            cached_html = self._cached_page(url)
+            if cached_html is not None:
+                return cached_html
+            
+            for attempt in range(max_retries):
+                await self.bucket.acquire_async()
                 
-                # Include only if we have both street name and building numbers
-                if (street_name and building_numbers and 
-                    not any(x in street_name for x in ['View', 'Browse', 'HPD', 'Number', 'This property', 'OR Enter Action Type', 'OR Select from List']) and
-                    not street_name.endswith(':') and
-                    not street_name.startswith('Select')):
+                logger.debug("Fetching URL (attempt %d/%d): %s", attempt + 1, max_retries, url)
+                async with session.get(url) as response:
+                    # Explicit rate limiting: honor Retry-After when the server sends it
+                    if response.status in RATE_LIMIT_STATUSES:
+                        delay = self._backoff_delay(attempt, retry_delay, response.headers.get('Retry-After'))
+                        logger.info(f"Rate limited (HTTP {response.status}), retrying in {delay:.1f} seconds...")
+                        # Pause the shared bucket so every worker backs off, not just
+                        # this one. The wait happens in acquire_async, after the
+                        # response has been released back to the connector.
+                        self.bucket.pause(delay)
+                        continue
+                    response.raise_for_status()
+                    html = await response.text()
+                
+                # Last resort: the queue page is served with a 200 status
+                if self.is_queue_page(html):
+                    self.consecutive_queues += 1
+                    logger.info(f"Request is in queue, waiting... (Consecutive queues: {self.consecutive_queues})")
                     
-                    # Clean up the building numbers format
-                    building_numbers = re.sub(r'\s*-\s*', '-', building_numbers)
-                    # Format as "building_numbers street_name"
-                    full_address = f"{building_numbers} {street_name}"
-                    if full_address not in secondary_addresses:  # Avoid duplicates while maintaining order
-                        secondary_addresses.append(full_address)
-        
-        if secondary_addresses:
-            data['Secondary Addresses'] = ', '.join(secondary_addresses)
-        
-        return data
+                    await asyncio.sleep(self._backoff_delay(attempt, retry_delay))
+                    continue
+                
+                # Reset consecutive queues counter on success
+                self.consecutive_queues = 0
+                logger.debug("Successfully fetched %s", url)
+                self._cache_page(url, html)
+                return html
+                
+            logger.error("Max retries reached, still queued or rate limited")
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return None
+
+    def _cached_page(self, url: str) -> Optional[str]:
+        """Return the cached copy of a page, or None if there is no unexpired copy."""
+        if self.cache is None:
+            return None
+        # On a cache miss requests-cache answers with a 504. Because of stale_if_error,
+        # expired copies also come back as 200; those are only meant as an error
+        # fallback, so they are fetched again.
+        cached = self.session.get(url, only_if_cached=True)
+        if cached.status_code == 200 and not cached.is_expired:
+            logger.debug("Loaded %s from cache", url)
+            return cached.text
+        return None
+
+    def _cache_page(self, url: str, html: str):
+        """Store a page fetched through aiohttp in the cache the requests sessions use."""
+        if self.cache is None:
+            return
+        # requests-cache stores requests responses, so wrap the page in one
+        body = html.encode('utf-8')
+        headers = {'Content-Type': 'text/html; charset=utf-8'}
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.request = requests.Request('GET', url).prepare()
+        response.raw = HTTPResponse(
+            body=io.BytesIO(body), headers=headers, status=200, reason='OK',
+            preload_content=False, request_url=url
+        )
+        self.cache.save_response(response, expires=datetime.now(timezone.utc) + CACHE_EXPIRE_AFTER)
 
     def parse_property_profile(self, html: str) -> Dict:
-        """
-        Parse the property profile page and extract building information.
-        
-        Args:
-            html (str): The HTML content to parse
-            
-        Returns:
-            Dict: Dictionary containing the extracted property information
-        """
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {}
-        
-        # Extract address information
-        address_info = self.extract_address_info(soup)
-        data.update(address_info)
-        
-        # Find all tables on the page
-        tables = soup.find_all('table')
-        logger.info(f"Found {len(tables)} tables on the page")
-        
-        # Skip navigation and header tables
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 2:
-                    key = self.clean_text(cols[0].text)
-                    value = self.clean_text(cols[1].text)
-                    
-                    # Skip empty or navigation-related entries
-                    if not key or not value or 'BIS Menu' in key or 'Privacy Policy' in key:
-                        continue
-                    
-                    # Clean up the key
-                    key = key.replace(':', '')
-                    
-                    # Skip if this is address-related info we already captured
-                    if 'Cross Street' in key or 'View Zoning' in key or 'View Challenge' in key:
-                        continue
-                    
-                    # Store the cleaned data
-                    data[key] = value
-        
-        return data
+        """Parse a property profile page with this scraper's parser."""
+        return parse_property_profile(html, self.parser)
 
     def get_property_profile(self, borough: str, block: str, lot: str) -> Optional[Dict]:
         """
@@ -408,42 +825,56 @@ class BISScraper:
         Returns:
             Optional[Dict]: Property profile information if found, None otherwise
         """
-        # Direct URL to property profile
-        profile_url = f"{self.base_url}/PropertyProfileOverviewServlet?boro={borough}&block={block}&lot={lot}&go3=+GO+&requestid=0"
-        logger.info(f"Accessing property profile for BBL: {borough}-{block}-{lot}")
+        profile_url = self._profile_url(borough, block, lot)
+        logger.debug("Accessing property profile for BBL: %s-%s-%s", borough, block, lot)
         
         detail_html = self.fetch_page(profile_url)
         if detail_html:
-            # Save the detail page for debugging
-            with open('temp/detail_page.html', 'w') as f:
-                f.write(detail_html)
-            logger.info("Saved detail page to temp/detail_page.html")
-            
-            data = self.parse_property_profile(detail_html)
-            # Add BBL information
-            data['Borough Code'] = borough
-            data['Block'] = block
-            data['Lot'] = lot
-            return data
+            self._save_detail_page(detail_html)
+            return self.parse_property_profile(detail_html)
         return None
 
-    def save_data(self, data: Dict, filename: str = 'property_data.csv'):
+    async def get_property_profile_async(self, session: aiohttp.ClientSession,
+                                         borough: str, block: str, lot: str) -> Optional[Dict]:
         """
-        Save the property data to a CSV file.
+        Get the property profile for a specific BBL through an aiohttp session.
+        
+        Parsing runs in the parse worker pool during an async run (or the event
+        loop's default executor otherwise) so it does not hold up the other
+        requests in flight.
         
         Args:
-            data (Dict): The property data to save
-            filename (str): The name of the output file
+            session (aiohttp.ClientSession): Session shared by all concurrent requests
+            borough (str): Borough code (1=Manhattan, 2=Bronx, 3=Brooklyn, 4=Queens, 5=Staten Island)
+            block (str): Block number
+            lot (str): Lot number
+            
+        Returns:
+            Optional[Dict]: Property profile information if found, None otherwise
         """
-        try:
-            # Convert single dictionary to DataFrame
-            df = pd.DataFrame([data])
-            df.to_csv(filename, index=False)
-            logger.info(f"Data saved to {filename}")
-        except Exception as e:
-            logger.error(f"Error saving data: {str(e)}")
+        profile_url = self._profile_url(borough, block, lot)
+        logger.debug("Accessing property profile for BBL: %s-%s-%s", borough, block, lot)
+        
+        detail_html = await self.fetch_page_async(session, profile_url)
+        if detail_html:
+            self._save_detail_page(detail_html)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._parse_pool, parse_property_profile, detail_html, self.parser)
+        return None
+
+    def _profile_url(self, borough: str, block: str, lot: str) -> str:
+        """Build the direct URL to a property profile."""
+        return self._profile_url_fmt.format(borough, block, lot)
 
-    def parse_bbl(self, bbl: str) -> Dict[str, str]:
+    def _save_detail_page(self, detail_html: str):
+        """Save the detail page for debugging."""
+        if self.debug:
+            os.makedirs('temp', exist_ok=True)
+            with open('temp/detail_page.html', 'w') as f:
+                f.write(detail_html)
+            logger.debug("Saved detail page to temp/detail_page.html")
+
+    def parse_bbl(self, bbl: str) -> Tuple[str, str, str]:
         """
         Parse a 10-digit BBL string into its components.
         
@@ -451,19 +882,23 @@ class BISScraper:
             bbl (str): 10-digit BBL string (1 digit borough + 5 digits block + 4 digits lot)
             
         Returns:
-            Dict containing borough, block, and lot
+            Tuple[str, str, str]: Borough, block, and lot
         """
         if len(bbl) != 10:
             raise ValueError("BBL must be 10 digits long")
             
-        return {
-            'borough': bbl[0],
-            'block': bbl[1:6],
-            'lot': bbl[6:10]
-        }
+        return bbl[0], bbl[1:6], bbl[6:10]
 
-def main():
-    scraper = BISScraper()
+def main(cache_backend: Optional[str] = 'sqlite', concurrency: int = 1):
+    """
+    Scrape every BBL in data/input/input_bbls.csv.
+    
+    Args:
+        cache_backend (Optional[str]): Backend for the cache of fetched pages, or None
+            to fetch every page again
+        concurrency (int): Number of BBLs fetched at once
+    """
+    scraper = BISScraper(cache_backend=cache_backend, concurrency=concurrency)
     
     # Process BBLs from input CSV
     input_csv = 'data/input/input_bbls.csv'  # CSV file containing BBLs
@@ -1,11 +1,24 @@
-import pandas as pd
+import csv
 import os
 from pathlib import Path
+from typing import List
+
+def _write_batch(output_dir: str, batch_num: int, header: List[str], rows: List[List[str]]):
+    """Write one batch of rows, with the input file's header, to batch_<batch_num>.csv."""
+    batch_file = os.path.join(output_dir, f'batch_{batch_num}.csv')
+    with open(batch_file, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+    print(f"Saved batch {batch_num} to {batch_file} ({len(rows)} BBLs)")
 
 def split_bbls_into_batches(input_file: str, batch_size: int = 1000, output_dir: str = 'data/input/batches'):
     """
     Split a large CSV file of BBLs into smaller batch files.
     
+    Rows are streamed from the input file to the batch files, so at most one
+    batch is held in memory and every field is copied through unchanged.
+    
     Args:
         input_file (str): Path to the input CSV file containing BBLs
         batch_size (int): Number of BBLs per batch
@@ -14,29 +27,37 @@ def split_bbls_into_batches(input_file: str, batch_size: int = 1000, output_dir:
     # Create output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Read the input file
-    df = pd.read_csv(input_file, dtype={'BBL': str})
-    
-    # Calculate number of batches
-    total_bbls = len(df)
-    num_batches = (total_bbls + batch_size - 1) // batch_size
-    
-    print(f"Splitting {total_bbls} BBLs into {num_batches} batches of {batch_size} BBLs each")
-    
-    # Split and save batches
-    for i in range(num_batches):
-        start_idx = i * batch_size
-        end_idx = min((i + 1) * batch_size, total_bbls)
-        batch_df = df.iloc[start_idx:end_idx]
+    total_bbls = 0
+    batch_num = 0
+    with open(input_file, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            print(f"No BBLs found in {input_file}")
+            return
         
-        # Save batch to CSV
-        batch_file = os.path.join(output_dir, f'batch_{i+1}.csv')
-        batch_df.to_csv(batch_file, index=False)
-        print(f"Saved batch {i+1} to {batch_file} ({len(batch_df)} BBLs)")
+        # Split and save batches
+        batch = []
+        for row in reader:
+            # Skip blank lines, as pandas did
+            if not any(row):
+                continue
+            batch.append(row)
+            if len(batch) == batch_size:
+                batch_num += 1
+                _write_batch(output_dir, batch_num, header, batch)
+                total_bbls += len(batch)
+                batch = []
+        if batch:
+            batch_num += 1
+            _write_batch(output_dir, batch_num, header, batch)
+            total_bbls += len(batch)
+    
+    print(f"Split {total_bbls} BBLs into {batch_num} batches of up to {batch_size} BBLs each")
 
 if __name__ == "__main__":
     # Path to your input file
     input_file = "data/input/input_bbls.csv"
     
     # Split into batches
-    split_bbls_into_batches(input_file) 
\ No newline at end of file
+    split_bbls_into_batches(input_file)
\ No newline at end of file
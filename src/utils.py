@@ -0,0 +1,24 @@
+import os
+from typing import List
+
+def list_batch_files(directory: str, prefix: str, suffix: str = '.csv') -> List[str]:
+    """
+    List the names of batch files in a directory, sorted by name.
+    
+    Uses os.scandir, so file names and types come straight from the directory
+    listing without an extra stat call per entry.
+    
+    Args:
+        directory (str): Directory to search
+        prefix (str): File name prefix, e.g. 'property_data_batch_'
+        suffix (str): File name suffix
+    
+    Returns:
+        List[str]: Sorted names of the matching files
+    """
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.name for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+            and entry.is_file(follow_symlinks=False)
+        )
\ No newline at end of file